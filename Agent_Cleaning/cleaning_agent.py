@@ -1,9 +1,10 @@
+import numpy as np
 import pandas as pd
 from langchain.tools import StructuredTool
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List
+from utils.llm import get_llm
 from .data_manager import DataFrameManager
 
 class CleaningToolSet:
@@ -22,20 +23,35 @@ class CleaningToolSet:
         This should be the first step to understand the data's condition.
         """
         df = self.df_manager.get_df()
-        null_counts = df.isnull().sum()
+        null_counts = df.isna().sum()
+        # Filter to the columns that actually have nulls before computing
+        # percentages, so clean columns cost nothing beyond the count.
+        null_counts = null_counts[null_counts > 0]
+
+        if null_counts.empty:
+            return "No missing values found in the DataFrame."
+
         summary_df = pd.DataFrame({
             'missing_count': null_counts,
-            'missing_percentage': (null_counts / len(df)) * 100
+            'missing_percentage': null_counts.mul(100.0 / len(df))
         })
-        summary_df = summary_df[summary_df['missing_count'] > 0]
-        
-        if summary_df.empty:
-            return "No missing values found in the DataFrame."
-        
+
         return f"Missing Values Summary:\n{summary_df.to_string()}"
 
     # (Inside the CleaningToolSet class in cleaning_agent.py)
 
+    @staticmethod
+    def _mode_value(column: pd.Series):
+        """
+        Most frequent value of a column, or None if it is all-null.
+        value_counts picks the top value directly, skipping mode()'s full
+        lexicographic sort over every equally-common value.
+        """
+        counts = column.value_counts(dropna=True)
+        if counts.empty:
+            return None
+        return counts.index[0]
+
     def impute_column(self, column_name: str, strategy: str) -> str:
         """
         Imputes (fills) missing values in a specified column using a given strategy.
@@ -47,19 +63,37 @@ class CleaningToolSet:
             return f"Error: Column '{column_name}' not found."
 
         try:
-            if strategy == 'mean':
-                fill_value = df[column_name].mean()
-            elif strategy == 'median':
-                fill_value = df[column_name].median()
-            elif strategy == 'mode':
-                fill_value = df[column_name].mode()[0]
+            column = df[column_name]
+            if pd.api.types.is_float_dtype(column):
+                # Float columns: one pass over the raw buffer. nanmean/
+                # nanmedian skip pandas' label alignment, and the masked
+                # copyto replaces fillna's mask-then-copy pipeline.
+                vals = column.to_numpy(copy=True)
+                if strategy == 'mean':
+                    fill_value = np.nanmean(vals)
+                elif strategy == 'median':
+                    fill_value = np.nanmedian(vals)
+                elif strategy == 'mode':
+                    fill_value = self._mode_value(column)
+                    if fill_value is None:
+                        return f"Error: Column '{column_name}' has no non-null values to take a mode from."
+                else:
+                    return f"Error: Invalid strategy '{strategy}'. Use 'mean', 'median', or 'mode'."
+                np.copyto(vals, fill_value, where=np.isnan(vals))
+                df[column_name] = vals
             else:
-                return f"Error: Invalid strategy '{strategy}'. Use 'mean', 'median', or 'mode'."
-            
-            # --- THIS IS THE ONLY CHANGE ---
-            # This is a more robust way to assign the result back to the DataFrame
-            df[column_name] = df[column_name].fillna(fill_value)
-            
+                if strategy == 'mean':
+                    fill_value = column.mean()
+                elif strategy == 'median':
+                    fill_value = column.median()
+                elif strategy == 'mode':
+                    fill_value = self._mode_value(column)
+                    if fill_value is None:
+                        return f"Error: Column '{column_name}' has no non-null values to take a mode from."
+                else:
+                    return f"Error: Invalid strategy '{strategy}'. Use 'mean', 'median', or 'mode'."
+                df[column_name] = column.fillna(fill_value)
+
             self.df_manager.update_df(df)
             return f"Successfully imputed column '{column_name}' with strategy '{strategy}'."
         except Exception as e:
@@ -84,7 +118,7 @@ class CleaningToolSet:
 def create_cleaning_agent(tools: List):
     """Builds and returns the LangChain agent for data cleaning."""
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
+    llm = get_llm(temperature=0.5)
     
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -3,16 +3,18 @@ import pandas as pd
 class DataFrameManager:
     """A simple class to hold and manage the state of the DataFrame."""
     def __init__(self, df: pd.DataFrame):
-        self._df = df.copy()
+        # Hold the frame by reference; pandas copy-on-write (enabled at app
+        # startup) protects callers from accidental shared mutation.
+        self._df = df
         print("✅ DataFrameManager initialized.")
 
     def get_df(self) -> pd.DataFrame:
-        """Returns a copy of the current DataFrame."""
-        return self._df.copy()
+        """Returns the current DataFrame."""
+        return self._df
 
     def update_df(self, new_df: pd.DataFrame):
         """Updates the internal DataFrame."""
-        self._df = new_df.copy()
+        self._df = new_df
         print("✅ DataFrame has been updated by a tool.")
 
 # This global instance will be shared across the agent's modules.
@@ -1,22 +1,31 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+from utils.llm import get_llm
+
+@lru_cache(maxsize=1)
 def create_analyzer_chain():
     """
     Builds and returns a LangChain chain that takes a statistical summary
     and generates a natural language report.
+
+    The chain is built once and memoized: constructing the Gemini client
+    is the expensive part, and the chain itself is stateless.
     """
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
+    llm = get_llm(temperature=0.5)
     
     # This detailed prompt is the "brain" of our analyzer.
     # It guides the LLM on how to structure its thoughts and what to focus on.
-    prompt = ChatPromptTemplate.from_template(
-        """You are an expert data analyst. Your job is to take a JSON object containing a statistical summary of a dataset and write a clear, concise, and insightful report for a business audience.
-
-        Here is the statistical summary you need to analyze:
-        {stats_json}
+    # The static instructions live in the system message so Gemini's implicit
+    # prefix caching can reuse them across calls; only the human turn varies.
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are an expert data analyst. Your job is to take a JSON object containing a statistical summary of a dataset and write a clear, concise, and insightful report for a business audience.
 
         Please structure your report with the following sections, using markdown for formatting:
 
@@ -34,7 +43,14 @@ def create_analyzer_chain():
         - Based on all the information, provide 1-2 concrete insights that a business could act on. For example, "The significant salary outlier could represent a high-value client or a senior employee, warranting further investigation." or "The dominance of 'New York' in the city data suggests this is a key market."
 
         Generate the report based on the provided JSON data.
-        """
+        """,
+            ),
+            (
+                "human",
+                """Here is the statistical summary you need to analyze:
+        {stats_json}""",
+            ),
+        ]
     )
     
     parser = StrOutputParser()
@@ -1,13 +1,14 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List
 
+from utils.llm import get_llm
+
 def create_inference_agent(tools: List):
     """Builds and returns the LangChain agent for statistical inference."""
-    
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
-    
+
+    llm = get_llm(temperature=0.5)
+
     prompt = ChatPromptTemplate.from_messages(
         [
             (
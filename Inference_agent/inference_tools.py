@@ -1,64 +1,243 @@
+import sys
+import os
+
+import numpy as np
+import orjson
 import pandas as pd
 from langchain.tools import StructuredTool
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Agent_Cleaning.data_manager import DataFrameManager
+from .outlier_kernel import count_outliers, iqr_outlier_counts
+
+# Categories beyond this are rolled up into an aggregate "other" count, so
+# ID-like columns can't blow up the profile payload.
+_TOP_K_CATEGORIES = 50
+
+# Above this many rows, quartiles are estimated on a uniform row sample.
+# The per-column O(n log n) quantile sort dominates profiling on huge
+# frames, and the sampling error at this sample size is far below anything
+# the report acts on; counts, means, extremes etc. stay exact.
+_EXACT_QUANTILE_ROWS = 1_000_000
+
+def _quantile_rows(arr: np.ndarray) -> np.ndarray:
+    """The rows quantiles are computed over: all of them, or a uniform sample."""
+    if len(arr) <= _EXACT_QUANTILE_ROWS:
+        return arr
+    idx = np.random.default_rng(0).choice(
+        len(arr), _EXACT_QUANTILE_ROWS, replace=False)
+    return arr[idx]
+
+def _profile_matrix(num: pd.DataFrame) -> np.ndarray:
+    """
+    The numeric block as a matrix for the profiling kernels. Huge frames
+    are extracted as float32: the quantile and fence passes are memory-
+    bound, so halving the bytes roughly doubles their throughput, and the
+    rounding is irrelevant next to the sampled quartiles. The DataFrame
+    itself keeps its dtypes — exact aggregates still run on it directly.
+    """
+    dtype = np.float32 if len(num) > _EXACT_QUANTILE_ROWS else np.float64
+    return num.to_numpy(dtype=dtype)
+
+def to_json(payload) -> str:
+    """
+    Serializes a stats payload to JSON with orjson, which handles NumPy
+    scalars and arrays natively — no per-value int()/float() unboxing.
+    """
+    return orjson.dumps(
+        payload,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        default=str,
+    ).decode()
+
 class InferenceToolSet:
-    """A class that holds a DataFrame and exposes statistical methods as tools."""
-    
-    def __init__(self, df: pd.DataFrame):
-        """Initializes the toolset with a specific DataFrame."""
-        self.df = df.copy()
-        print("✅ InferenceToolSet initialized with a DataFrame.")
-
-    def get_basic_statistics(self) -> dict:
+    """A class that holds a DataFrameManager and exposes statistical methods as tools."""
+
+    def __init__(self, df_manager: DataFrameManager):
+        """Initializes the toolset with a shared DataFrameManager instance."""
+        self._mgr = df_manager
+        self._tools = None
+        self._split_df = None
+        print("✅ InferenceToolSet initialized with a DataFrameManager.")
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The shared DataFrame — a reference, not a copy, under copy-on-write."""
+        return self._mgr.get_df()
+
+    def _split_columns(self):
         """
-        Calculates basic descriptive statistics (mean, median, std, min, max) 
-        for all numerical columns in the DataFrame.
+        Numeric/categorical column partition, computed once per frame and
+        reused by every tool method instead of re-walking the dtypes.
         """
-        numerical_cols = self.df.select_dtypes(include=["number"]).columns
+        df = self.df
+        if df is not self._split_df:
+            self._numeric_cols = df.select_dtypes(include=["number"]).columns
+            self._categorical_cols = df.select_dtypes(
+                include=["object", "string", "category"]).columns
+            self._split_df = df
+        return self._numeric_cols, self._categorical_cols
+
+    def _basic_statistics(self) -> dict:
+        """Raw basic-statistics payload, possibly holding NumPy scalars."""
+        numerical_cols, _ = self._split_columns()
         if len(numerical_cols) == 0:
             return {"message": "No numerical columns found."}
-        
+
         stats = self.df[numerical_cols].describe().to_dict()
         return stats
 
-    def detect_outliers(self) -> dict:
+    def get_basic_statistics(self) -> str:
         """
-        Detects outliers in numerical columns using the IQR (Interquartile Range) method.
-        Returns a dictionary with the count of outliers for each numerical column.
+        Calculates basic descriptive statistics (mean, median, std, min, max)
+        for all numerical columns in the DataFrame. Returns JSON.
         """
-        numerical_cols = self.df.select_dtypes(include=["number"]).columns
+        return to_json(self._basic_statistics())
+
+    def _detect_outliers(self) -> dict:
+        """Raw per-column IQR outlier counts."""
+        numerical_cols, _ = self._split_columns()
         if len(numerical_cols) == 0:
             return {"message": "No numerical columns found for outlier detection."}
         
-        outliers_summary = {}
-        for col in numerical_cols:
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outlier_condition = (self.df[col] < (Q1 - 1.5 * IQR)) | (self.df[col] > (Q3 + 1.5 * IQR))
-            outliers_summary[col] = int(outlier_condition.sum())
-            
+        arr = _profile_matrix(self.df[numerical_cols])
+        q_arr = _quantile_rows(arr)
+        if iqr_outlier_counts is not None and q_arr is arr:
+            # Fused numba kernel: quartiles and counts in one pass per
+            # column, parallelized across columns, no boolean mask.
+            counts = iqr_outlier_counts(arr)
+        else:
+            # One quantile call for all columns on the array we already
+            # extracted (sampled rows on huge frames), then the fences are
+            # applied to every row — only the quantiles are approximate.
+            q = np.nanquantile(q_arr, [0.25, 0.75], axis=0)
+            iqr = q[1] - q[0]
+            lo = q[0] - 1.5 * iqr
+            hi = q[1] + 1.5 * iqr
+            if count_outliers is not None:
+                counts = count_outliers(arr, lo, hi)
+            else:
+                counts = ((arr < lo) | (arr > hi)).sum(axis=0)
+        outliers_summary = dict(zip(numerical_cols, counts.tolist()))
+
         return {"outliers_count": outliers_summary}
 
-    def analyze_categorical_data(self) -> dict:
+    def detect_outliers(self) -> str:
         """
-        Analyzes categorical columns by calculating value counts and the number of unique values.
+        Detects outliers in numerical columns using the IQR (Interquartile Range) method.
+        Returns a JSON object with the count of outliers for each numerical column.
         """
-        categorical_cols = self.df.select_dtypes(include=["object", "category"]).columns
+        return to_json(self._detect_outliers())
+
+    def _analyze_categorical_data(self) -> dict:
+        """Raw per-column value counts and cardinalities."""
+        _, categorical_cols = self._split_columns()
         if len(categorical_cols) == 0:
             return {"message": "No categorical columns found."}
-        
+
+        # Promote low-cardinality text columns to category once so
+        # value_counts runs on integer codes instead of re-hashing
+        # strings. Everything here that isn't category already is some
+        # string dtype — object, Arrow-backed or str — so only category
+        # itself is excluded. ID-like columns (mostly unique values) gain
+        # nothing from the dictionary encoding, so leave them be.
+        for col in categorical_cols:
+            series = self.df[col]
+            # Legacy object-dtype columns (frames built outside the Arrow
+            # upload path on pandas 2) are re-homed on Arrow string
+            # buffers so nunique/value_counts hash compact buffers rather
+            # than boxed objects; Arrow-backed and str columns already
+            # are and skip straight to the promotion check.
+            if series.dtype == object:
+                series = series.astype("string[pyarrow]")
+                self.df[col] = series
+            if (not isinstance(series.dtype, pd.CategoricalDtype)
+                    and series.nunique() * 2 < len(series)):
+                self.df[col] = series.astype("category")
+
         categorical_analysis = {}
         for col in categorical_cols:
-            categorical_analysis[col] = {
-                "value_counts": self.df[col].value_counts().to_dict(),
-                "unique_values_count": int(self.df[col].nunique())
+            # Cap the serialized counts: the downstream LLM prompt can't
+            # usefully consume thousands of categories anyway. Cardinality
+            # falls out of value_counts, so no separate nunique pass.
+            value_counts = self.df[col].value_counts()
+            entry = {
+                "value_counts": value_counts.head(_TOP_K_CATEGORIES).to_dict(),
+                "unique_values_count": value_counts.size
             }
+            if value_counts.size > _TOP_K_CATEGORIES:
+                entry["other_count"] = value_counts.iloc[_TOP_K_CATEGORIES:].sum()
+            categorical_analysis[col] = entry
         return categorical_analysis
-            
+
+    def analyze_categorical_data(self) -> str:
+        """
+        Analyzes categorical columns by calculating value counts and the
+        number of unique values. Returns JSON.
+        """
+        return to_json(self._analyze_categorical_data())
+
+    def full_profile(self) -> dict:
+        """
+        Combined statistical profile with the numeric work fused: the
+        quartiles describe() already computed are fed straight into the IQR
+        outlier comparison, so the numeric block is never re-sorted for a
+        second quantile pass.
+        """
+        numerical_cols, categorical_cols = self._split_columns()
+        if len(numerical_cols) == 0:
+            # Skip the describe/IQR block wholesale on non-numeric frames.
+            basic = {"message": "No numerical columns found."}
+            outliers = {}
+        else:
+            num = self.df[numerical_cols]
+            arr = _profile_matrix(num)
+            if len(num) <= _EXACT_QUANTILE_ROWS:
+                stats_df = num.describe()
+            else:
+                # Exact O(n) aggregates plus quartiles from a row sample:
+                # describe()'s per-column quantile sorts are the only part
+                # of the profile worth approximating on huge frames.
+                quartiles = pd.DataFrame(
+                    np.nanquantile(_quantile_rows(arr), [0.25, 0.5, 0.75],
+                                   axis=0),
+                    index=["25%", "50%", "75%"], columns=num.columns)
+                stats_df = pd.concat(
+                    [num.agg(["count", "mean", "std", "min", "max"]),
+                     quartiles]
+                ).loc[["count", "mean", "std", "min",
+                       "25%", "50%", "75%", "max"]]
+            basic = stats_df.to_dict()
+            q1 = stats_df.loc['25%'].to_numpy()
+            q3 = stats_df.loc['75%'].to_numpy()
+            iqr = q3 - q1
+            lo = q1 - 1.5 * iqr
+            hi = q3 + 1.5 * iqr
+            if count_outliers is not None:
+                # numba kernel: compare and reduce fused per column, no
+                # (rows, cols) boolean mask allocated.
+                counts = count_outliers(arr, lo, hi)
+            else:
+                counts = ((arr < lo) | (arr > hi)).sum(axis=0)
+            outliers = dict(zip(numerical_cols, counts.tolist()))
+
+        if len(categorical_cols) == 0:
+            categorical = {"message": "No categorical columns found."}
+        else:
+            categorical = self._analyze_categorical_data()
+
+        return {
+            "basic_statistics": basic,
+            "outliers_count": outliers,
+            "categorical_analysis": categorical
+        }
+
     def get_tools(self):
-        """Returns a list of Tool objects for the agent."""
-        
+        """Returns a list of Tool objects for the agent, built once."""
+        if self._tools is not None:
+            return self._tools
+
         stats_tool = StructuredTool.from_function(
             func=self.get_basic_statistics,
             name="get_basic_statistics",
@@ -76,5 +255,6 @@ class InferenceToolSet:
             name="analyze_categorical_data",
             description="Analyzes categorical columns, returning value counts and unique value counts."
         )
-        
-        return [stats_tool, outlier_tool, categorical_tool]
+
+        self._tools = [stats_tool, outlier_tool, categorical_tool]
+        return self._tools
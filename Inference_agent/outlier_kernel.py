@@ -0,0 +1,77 @@
+"""Fused IQR outlier-count kernel for numeric-heavy DataFrames.
+
+When numba is installed, the kernel computes each column's quartiles and
+outlier count in a single cache-friendly pass, parallelized across columns
+with prange — no (rows x cols) boolean mask is ever materialized. numba is
+optional: callers fall back to the vectorized pandas/NumPy path when the
+kernel is unavailable.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _quantile_sorted(srt, q):
+        """Linearly interpolated quantile of an ascending-sorted array."""
+        h = q * (srt.size - 1)
+        i = int(h)
+        if i + 1 < srt.size:
+            return srt[i] + (h - i) * (srt[i + 1] - srt[i])
+        return srt[i]
+
+    @njit(parallel=True, cache=True)
+    def iqr_outlier_counts(arr):
+        """
+        Counts IQR outliers per column of a float64 (rows, cols) array.
+        NaNs are ignored, matching pandas' quantile behavior.
+        """
+        n, k = arr.shape
+        out = np.empty(k, np.int64)
+        for j in prange(k):
+            col = arr[:, j]
+            vals = col[~np.isnan(col)]
+            m = vals.size
+            if m == 0:
+                out[j] = 0
+                continue
+            srt = np.sort(vals)
+            q1 = _quantile_sorted(srt, 0.25)
+            q3 = _quantile_sorted(srt, 0.75)
+            iqr = q3 - q1
+            lo = q1 - 1.5 * iqr
+            hi = q3 + 1.5 * iqr
+            c = 0
+            for i in range(m):
+                v = srt[i]
+                if v < lo or v > hi:
+                    c += 1
+            out[j] = c
+        return out
+
+    @njit(parallel=True, cache=True)
+    def count_outliers(arr, lo, hi):
+        """
+        Counts values outside per-column [lo, hi] bounds for a float64
+        (rows, cols) array. Compare and reduce are fused per column, so
+        no (rows, cols) boolean mask is allocated; NaN compares false on
+        both bounds and is never counted.
+        """
+        n, k = arr.shape
+        out = np.zeros(k, np.int64)
+        for j in prange(k):
+            c = 0
+            for i in range(n):
+                v = arr[i, j]
+                if v < lo[j] or v > hi[j]:
+                    c += 1
+            out[j] = c
+        return out
+
+else:
+    iqr_outlier_counts = None
+    count_outliers = None
@@ -1,20 +1,99 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from langchain.tools import StructuredTool
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List, Any, Union
 import streamlit as st
 
+from utils.cleaner import dataframe_hash
+from utils.llm import get_llm
+
+# Bounds on what gets shipped to the browser: charts stay O(bins) or
+# O(sample) regardless of how many rows the dataset has.
+_HISTOGRAM_BINS = 50
+_MAX_SCATTER_POINTS = 2000
+
+# The figure builders are cached on the content of the plotted columns:
+# LLM retries and repeated requests for the same chart skip both the
+# aggregation and the Plotly figure construction.
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_hash})
+def _histogram_fig(plot_df: pd.DataFrame, column_name: str) -> go.Figure:
+    # Pre-bin in NumPy and send only the bins to the browser,
+    # instead of shipping every datapoint for Plotly to bin there.
+    values = plot_df[column_name].dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=_HISTOGRAM_BINS)
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure(go.Bar(x=centers, y=counts, width=np.diff(edges)))
+    fig.update_layout(title=f"Distribution of {column_name}",
+                      xaxis_title=column_name, yaxis_title="count",
+                      bargap=0)
+    return fig
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_hash})
+def _bar_fig(plot_df: pd.DataFrame, column_name: str) -> go.Figure:
+    # Plot straight from the counts Series: no reset_index/rename
+    # reshape and no Plotly Express schema inference on a frame.
+    counts = plot_df[column_name].value_counts()
+    fig = go.Figure(go.Bar(x=counts.index.astype(str), y=counts.values))
+    fig.update_layout(title=f"Value Counts of {column_name}",
+                      xaxis_title=column_name, yaxis_title="count")
+    return fig
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_hash})
+def _scatter_fig(plot_df: pd.DataFrame, x_column: str, y_column: str) -> go.Figure:
+    # Down-sample large frames so the figure payload stays bounded;
+    # a uniform sample preserves the shape of the relationship.
+    if len(plot_df) > _MAX_SCATTER_POINTS:
+        plot_df = plot_df.sample(_MAX_SCATTER_POINTS, random_state=0)
+
+    return px.scatter(plot_df, x=x_column, y=y_column,
+                      title=f"Relationship between {x_column} and {y_column}")
+
 class VisualizerToolSet:
     """A class that holds a DataFrame and exposes visualization methods as tools."""
     
     def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+        # The plot methods only read the frame, so hold it by reference;
+        # copy-on-write covers any accidental mutation elsewhere.
+        self.df = df
+        # Column membership and numeric-dtype checks run on every tool
+        # call, so resolve them to sets once instead of walking the Index
+        # and introspecting dtypes each time.
+        self._col_set = set(df.columns)
+        self._numeric_cols = set(df.select_dtypes(include="number").columns)
         print("✅ VisualizerToolSet initialized with a DataFrame.")
 
+    @staticmethod
+    def _publish_chart(chart_key: str, fig: go.Figure, trace_attrs) -> go.Figure:
+        """
+        Stores the figure in session state for the app to render.
+
+        A skeleton figure is kept per chart key: when the same chart is
+        requested again with new data, only the trace arrays are swapped
+        into the already-mounted figure, so the layout is never rebuilt or
+        re-serialized and Streamlit can reuse the DOM node (the app passes
+        the key to st.plotly_chart).
+        """
+        skeleton_key = f"chart-skeleton-{chart_key}"
+        skeleton = st.session_state.get(skeleton_key)
+        if skeleton is not None:
+            skeleton.data[0].update(
+                {attr: getattr(fig.data[0], attr) for attr in trace_attrs})
+            fig = skeleton
+        else:
+            st.session_state[skeleton_key] = fig
+
+        # Store the chart in Streamlit session state directly
+        if 'current_chart' not in st.session_state:
+            st.session_state.current_chart = None
+        st.session_state.current_chart = fig
+        st.session_state.current_chart_key = chart_key
+        return fig
+
     def plot_histogram(self, column_name: str) -> str:
         """
         Generates and stores an interactive histogram for a single numerical column.
@@ -23,20 +102,19 @@ class VisualizerToolSet:
             column_name (str): The name of the numerical column to plot.
         """
         try:
-            if column_name not in self.df.columns:
+            if column_name not in self._col_set:
                 return f"Error: Column '{column_name}' not found in the data."
-                
+
             # Check if column is numerical
-            if not pd.api.types.is_numeric_dtype(self.df[column_name]):
+            if column_name not in self._numeric_cols:
                 return f"Error: Column '{column_name}' is not numerical. Histograms require numerical data."
             
-            fig = px.histogram(self.df, x=column_name, title=f"Distribution of {column_name}")
-            
-            # Store the chart in Streamlit session state directly
-            if 'current_chart' not in st.session_state:
-                st.session_state.current_chart = None
-            st.session_state.current_chart = fig
-            
+            # Only the plotted column goes into the cached builder, so the
+            # cache key is a hash of that column, not the whole frame.
+            fig = _histogram_fig(self.df[[column_name]], column_name)
+            fig = self._publish_chart(f"hist-{column_name}", fig,
+                                      ("x", "y", "width"))
+
             return f"✅ Successfully created histogram for '{column_name}'"
             
         except Exception as e:
@@ -50,18 +128,12 @@ class VisualizerToolSet:
             column_name (str): The name of the categorical column to plot.
         """
         try:
-            if column_name not in self.df.columns:
+            if column_name not in self._col_set:
                 return f"Error: Column '{column_name}' not found in the data."
-            
-            counts = self.df[column_name].value_counts().reset_index()
-            counts.columns = [column_name, 'count']
-            fig = px.bar(counts, x=column_name, y='count', title=f"Value Counts of {column_name}")
-            
-            # Store the chart in Streamlit session state directly
-            if 'current_chart' not in st.session_state:
-                st.session_state.current_chart = None
-            st.session_state.current_chart = fig
-                
+
+            fig = _bar_fig(self.df[[column_name]], column_name)
+            fig = self._publish_chart(f"bar-{column_name}", fig, ("x", "y"))
+
             return f"✅ Successfully created bar chart for '{column_name}'"
             
         except Exception as e:
@@ -77,28 +149,24 @@ class VisualizerToolSet:
         """
         try:
             # Validate columns exist
-            missing_cols = [col for col in [x_column, y_column] if col not in self.df.columns]
+            missing_cols = [col for col in [x_column, y_column] if col not in self._col_set]
             if missing_cols:
                 available_cols = list(self.df.columns)
                 return f"Error: Column(s) {missing_cols} not found. Available columns: {available_cols}"
-            
+
             # Check if columns are numerical
             non_numeric = []
             for col in [x_column, y_column]:
-                if not pd.api.types.is_numeric_dtype(self.df[col]):
+                if col not in self._numeric_cols:
                     non_numeric.append(col)
             
             if non_numeric:
                 return f"Error: Column(s) {non_numeric} are not numerical. Scatter plots require numerical data."
             
-            fig = px.scatter(self.df, x=x_column, y=y_column, 
-                           title=f"Relationship between {x_column} and {y_column}")
-            
-            # Store the chart in Streamlit session state directly
-            if 'current_chart' not in st.session_state:
-                st.session_state.current_chart = None
-            st.session_state.current_chart = fig
-            
+            fig = _scatter_fig(self.df[[x_column, y_column]], x_column, y_column)
+            fig = self._publish_chart(f"scatter-{x_column}-{y_column}", fig,
+                                      ("x", "y"))
+
             return f"✅ Successfully created scatter plot of '{x_column}' vs '{y_column}'"
             
         except Exception as e:
@@ -127,7 +195,7 @@ class VisualizerToolSet:
 def create_visualizer_agent(tools: List):
     """Builds and returns the LangChain agent for data visualization."""
     
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1)
+    llm = get_llm(temperature=0.1)
     
     prompt = ChatPromptTemplate.from_messages(
         [
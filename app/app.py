@@ -7,6 +7,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Copy-on-write lets DataFrameManager and the tool sets share one frame
+# by reference instead of defensively copying it on every hand-off.
+pd.set_option("mode.copy_on_write", True)
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from orchestrator import Orchestrator
@@ -22,6 +26,10 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "current_chart" not in st.session_state:
     st.session_state.current_chart = None
+if "current_chart_key" not in st.session_state:
+    st.session_state.current_chart_key = None
+if "insights" not in st.session_state:
+    st.session_state.insights = None
 
 # Main app logic
 uploaded_file = st.file_uploader("Upload your CSV file to begin analysis", type=["csv"])
@@ -29,12 +37,18 @@ uploaded_file = st.file_uploader("Upload your CSV file to begin analysis", type=
 if uploaded_file is not None and not st.session_state.analysis_complete:
     with st.spinner("🚀 Starting analysis... This may take a moment."):
         try:
-            df = pd.read_csv(uploaded_file)
+            # Multi-threaded Arrow CSV parsing with Arrow-backed columns:
+            # much faster than the default C parser on multi-MB uploads, and
+            # Arrow strings make the downstream categorical work cheaper.
+            df = pd.read_csv(uploaded_file, engine="pyarrow", dtype_backend="pyarrow")
             orchestrator = Orchestrator()
-            insights, cleaned_df = orchestrator.run_pipeline(df)
+            report_stream, cleaned_df = orchestrator.run_pipeline(df)
 
             st.session_state.cleaned_df = cleaned_df
-            st.session_state.insights = insights
+            # The report streams into the page below; the joined text is
+            # captured there for redisplay on later reruns.
+            st.session_state.report_stream = report_stream
+            st.session_state.insights = None
             st.session_state.orchestrator = orchestrator  # Store orchestrator in session state
             vis_tool_set = VisualizerToolSet(cleaned_df)
             st.session_state.visualizer_agent = create_visualizer_agent(vis_tool_set.get_tools())
@@ -46,7 +60,21 @@ if uploaded_file is not None and not st.session_state.analysis_complete:
 
 if st.session_state.analysis_complete:
     st.header("📊 Automated Analysis Report")
-    st.markdown(st.session_state.insights)
+    if st.session_state.insights is None:
+        # First render: show tokens as they arrive instead of blocking on
+        # the full report, then keep the joined text for later reruns.
+        try:
+            st.session_state.insights = st.write_stream(st.session_state.report_stream)
+        except Exception as e:
+            # The LLM call happens lazily inside the stream, so a Gemini
+            # failure surfaces here. Reset the pipeline state so a rerun
+            # retries from the upload instead of keeping a dead stream.
+            st.session_state.insights = None
+            st.session_state.analysis_complete = False
+            st.error(f"An error occurred while generating the report: {e}")
+            st.stop()
+    else:
+        st.markdown(st.session_state.insights)
     
     # Create tabs for different functionalities
     tab1, tab2 = st.tabs(["💬 Data Visualizer", "🔬 What-If Analysis"])
@@ -87,17 +115,23 @@ if st.session_state.analysis_complete:
                     
                     # Check if a chart was created and stored in session state
                     if st.session_state.current_chart is not None:
-                        # Display the chart
-                        st.plotly_chart(st.session_state.current_chart, use_container_width=True)
-                        
+                        # Display the chart. The stable per-chart key lets
+                        # Streamlit reuse the mounted plot when the same
+                        # chart is re-requested with new data.
+                        st.plotly_chart(st.session_state.current_chart,
+                                        use_container_width=True,
+                                        key=st.session_state.current_chart_key)
+
                         # Display success message
                         st.success(text_response)
-                        
-                        # Store both chart and text in message history
+
+                        # Store both chart and text in message history.
+                        # A snapshot copy goes into history so later in-place
+                        # updates to the live skeleton can't rewrite it.
                         st.session_state.messages.append({
-                            "role": "assistant", 
+                            "role": "assistant",
                             "content": {
-                                "chart": st.session_state.current_chart,
+                                "chart": go.Figure(st.session_state.current_chart),
                                 "text": text_response
                             }
                         })
@@ -157,13 +191,13 @@ if st.session_state.analysis_complete:
                 
                 with st.spinner("🧪 Running scenario..."):
                     try:
-                        scenario_report = st.session_state.orchestrator.run_what_if_scenario(
+                        scenario_stream = st.session_state.orchestrator.run_what_if_scenario(
                             df=st.session_state.cleaned_df,
                             modifications=modifications
                         )
-                        
+
                         st.markdown("### 📊 Scenario Results")
-                        st.markdown(scenario_report)
+                        st.write_stream(scenario_stream)
                         
                         # Show the impact summary
                         st.markdown("### 📈 Impact Summary")
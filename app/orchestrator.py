@@ -1,7 +1,10 @@
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 import sys
 import os
-from typing import Tuple, Dict, Any
+from typing import Iterator, Tuple, Dict, Any
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -13,87 +16,173 @@ from Analyzer_agent.analyzer_agent import create_analyzer_chain
 class Orchestrator:
     """Manages the end-to-end data analysis pipeline."""
 
-    def run_pipeline(self, df: pd.DataFrame) -> Tuple[str, pd.DataFrame]:
-        """Executes the full Clean -> Profile -> Analyze pipeline."""
+    def __init__(self):
+        # Build the analyzer chain once; run_pipeline and the what-if
+        # scenarios all reuse the same chain and underlying LLM client.
+        self._analyzer = create_analyzer_chain()
+        # Reports keyed by a hash of the stats payload: re-running the same
+        # data or what-if scenario skips the LLM call entirely.
+        self._report_cache: Dict[str, str] = {}
+        # Baseline profile of the cleaned frame, kept so what-if scenarios
+        # can splice in single-column updates instead of re-profiling.
+        self._baseline_profile: Dict[str, Any] = None
+
+    def _stream_report(self, stats_json: str) -> Iterator[str]:
+        """
+        Streams the analyzer chain's report token by token, caching the
+        assembled report per stats payload. Cache hits yield the stored
+        report in one piece.
+        """
+        key = hashlib.blake2b(stats_json.encode()).hexdigest()
+        cached = self._report_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self._analyzer.stream({"stats_json": stats_json}):
+            chunks.append(chunk)
+            yield chunk
+        self._report_cache[key] = "".join(chunks)
+
+    def _spliced_profile(self, col: str, new_stats: Dict[str, Any],
+                         quartiles: Tuple[float, float],
+                         outlier_count: int) -> str:
+        """
+        Rebuilds the stats JSON for a what-if scenario from the cached
+        baseline profile: only the modified column's entries are replaced
+        with the analytically derived statistics, the rest of the profile
+        is reused as-is.
+        """
+        profile = dict(self._baseline_profile)
+        basic = dict(profile.get("basic_statistics", {}))
+        outliers = dict(profile.get("outliers_count", {}))
+        q1, q3 = quartiles
+
+        basic[col] = {
+            "count": float(basic[col]["count"]),
+            "mean": float(new_stats['mean']),
+            "std": float(new_stats['std']),
+            "min": float(new_stats['min']),
+            "25%": float(q1),
+            "50%": float(new_stats['median']),
+            "75%": float(q3),
+            "max": float(new_stats['max'])
+        }
+        outliers[col] = int(outlier_count)
+
+        profile["basic_statistics"] = basic
+        profile["outliers_count"] = outliers
+        return json.dumps(profile, default=str)
+
+    def run_pipeline(self, df: pd.DataFrame) -> Tuple[Iterator[str], pd.DataFrame]:
+        """
+        Executes the full Clean -> Profile -> Analyze pipeline.
+
+        Returns a stream of report chunks rather than the finished report,
+        so the UI can render tokens as they arrive instead of blocking on
+        the full generation.
+        """
         print("🚀 Starting pipeline...")
 
         # 1. Clean the DataFrame
         cleaned_df = clean_dataframe(df)
 
+        # Promote low-cardinality text columns to category dtype once, so
+        # every downstream scan (profiling, what-if, visualization) works on
+        # integer codes instead of re-hashing strings. Uploads arrive
+        # Arrow-backed, so string dtypes must be matched alongside object.
+        for c in cleaned_df.select_dtypes(include=["object", "string"]):
+            if cleaned_df[c].nunique() / len(cleaned_df) < 0.5:
+                cleaned_df[c] = cleaned_df[c].astype("category")
+
         # 2. Profile the DataFrame
         stats_json = profile_dataframe(cleaned_df)
+        self._baseline_profile = json.loads(stats_json)
 
         # 3. Analyze the results with the AI agent
         print("\n--- 🧠 Invoking Analyzer Agent ---")
-        analyzer_chain = create_analyzer_chain()
-        insights_report = analyzer_chain.invoke({"stats_json": stats_json})
-        print("--- ✅ Analysis Complete ---")
-
-        return insights_report, cleaned_df
+        return self._stream_report(stats_json), cleaned_df
 
-    def run_what_if_scenario(self, df: pd.DataFrame, modifications: Dict[str, Any]) -> str:
+    def run_what_if_scenario(self, df: pd.DataFrame, modifications: Dict[str, Any]) -> Iterator[str]:
         """
-        Runs a what-if scenario locally on a copy of the data based on direct inputs.
-        
+        Runs a what-if scenario locally based on direct inputs.
+
         Args:
             df: Original cleaned DataFrame
             modifications: Dict containing column, change_type, and value
-            
+
         Returns:
-            Formatted analysis report of the what-if scenario
+            A stream of report chunks: the precomputed impact summary first,
+            then the AI analysis as it is generated.
         """
         print(f"\n--- 🚀 Starting What-If Scenario: {modifications} ---")
         
         try:
-            # Create a copy to avoid modifying original data
-            modified_df = df.copy()
-            original_df = df.copy()
-            
             # Unpack the modification instructions
             col = modifications['column']
             change_type = modifications['change_type']
             val = modifications['value']
-            
+
             # Validate column exists
-            if col not in modified_df.columns:
-                return f"❌ Error: Column '{col}' not found in the dataset."
-            
+            if col not in df.columns:
+                return iter([f"❌ Error: Column '{col}' not found in the dataset."])
+
             # Validate column is numerical
-            if not pd.api.types.is_numeric_dtype(modified_df[col]):
-                return f"❌ Error: Column '{col}' is not numerical. What-if analysis requires numerical columns."
-            
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                return iter([f"❌ Error: Column '{col}' is not numerical. What-if analysis requires numerical columns."])
+
+            # Only the target column changes, so work on its NumPy array and
+            # leave the frame untouched until the analyzer needs it in full.
+            orig_arr = df[col].to_numpy()
+
             # Store original statistics for comparison
             original_stats = {
-                'mean': original_df[col].mean(),
-                'median': original_df[col].median(),
-                'std': original_df[col].std(),
-                'min': original_df[col].min(),
-                'max': original_df[col].max()
+                'mean': np.mean(orig_arr),
+                'median': np.median(orig_arr),
+                'std': np.std(orig_arr, ddof=1),
+                'min': np.min(orig_arr),
+                'max': np.max(orig_arr)
             }
-            
-            # Apply the modification based on change type
+
+            # Apply the modification based on change type. Rescaling by a
+            # constant has closed-form effects on every statistic we report,
+            # so the percentage branches never materialize a modified column.
             if change_type == 'Percentage Increase':
-                modified_df[col] = modified_df[col] * (1 + val / 100)
+                scale = 1 + val / 100
                 change_description = f"increased all {col} values by {val}%"
             elif change_type == 'Percentage Decrease':
-                modified_df[col] = modified_df[col] * (1 - val / 100)
+                scale = 1 - val / 100
                 change_description = f"decreased all {col} values by {val}%"
             elif change_type == 'Set to Value':
-                modified_df[col] = val
+                scale = None
                 change_description = f"set all {col} values to {val}"
             else:
-                return f"❌ Error: Unknown change type '{change_type}'"
-            
+                return iter([f"❌ Error: Unknown change type '{change_type}'"])
+
             print(f"--- ✅ Applied modification: {change_description} ---")
-            
-            # Calculate new statistics
-            new_stats = {
-                'mean': modified_df[col].mean(),
-                'median': modified_df[col].median(),
-                'std': modified_df[col].std(),
-                'min': modified_df[col].min(),
-                'max': modified_df[col].max()
-            }
+
+            # Calculate new statistics: mean/median/min/max scale linearly,
+            # std by |scale|, and a negative scale swaps the extremes. A
+            # constant column has zero spread by definition.
+            if scale is not None:
+                new_min, new_max = sorted((scale * original_stats['min'],
+                                           scale * original_stats['max']))
+                new_stats = {
+                    'mean': scale * original_stats['mean'],
+                    'median': scale * original_stats['median'],
+                    'std': abs(scale) * original_stats['std'],
+                    'min': new_min,
+                    'max': new_max
+                }
+            else:
+                new_stats = {
+                    'mean': float(val),
+                    'median': float(val),
+                    'std': 0.0,
+                    'min': float(val),
+                    'max': float(val)
+                }
             
             # Calculate changes
             stats_changes = {}
@@ -107,14 +196,17 @@ class Orchestrator:
             print("--- 🧮 Calculating impact on other variables ---")
             
             # Analyze impact on other numerical columns (simple correlation analysis)
-            numerical_cols = modified_df.select_dtypes(include=['number']).columns.tolist()
+            numerical_cols = df.select_dtypes(include=['number']).columns.tolist()
             impact_analysis = {}
-            
+
+            # One matrix computation instead of a pairwise corr() per column;
+            # the loop below just indexes into the precomputed row.
+            corr_row = df[numerical_cols].corr()[col].dropna()
+
             for other_col in numerical_cols:
-                if other_col != col:
-                    # Calculate correlation between modified column and other columns
-                    correlation = original_df[col].corr(original_df[other_col])
-                    
+                if other_col != col and other_col in corr_row:
+                    correlation = corr_row[other_col]
+
                     if abs(correlation) > 0.1:  # Only report if correlation is meaningful
                         # Estimate impact based on correlation and change
                         if change_type in ['Percentage Increase', 'Percentage Decrease']:
@@ -129,12 +221,36 @@ class Orchestrator:
                             'estimated_impact': estimated_impact
                         }
             
-            # Re-run the Profiler and Analyzer on the MODIFIED data for comprehensive analysis
+            # Re-analyze the MODIFIED data for the AI report. Only one column
+            # changed, so when the baseline profile is available the new
+            # profile is spliced from it instead of re-profiling every column.
             print("--- 📊 Re-analyzing modified dataset ---")
-            stats_json = profile_dataframe(modified_df)
-            analyzer_chain = create_analyzer_chain()
-            scenario_report = analyzer_chain.invoke({"stats_json": stats_json})
-            
+            if self._baseline_profile is not None and \
+                    col in self._baseline_profile.get("basic_statistics", {}):
+                base_col = self._baseline_profile["basic_statistics"][col]
+                if scale:
+                    # Rescaling preserves outlier membership and scales the
+                    # quartiles along with the data.
+                    q1, q3 = sorted((scale * float(base_col['25%']),
+                                     scale * float(base_col['75%'])))
+                    outlier_count = self._baseline_profile.get(
+                        "outliers_count", {}).get(col, 0)
+                else:
+                    # Constant column: quartiles collapse, no outliers.
+                    q1 = q3 = new_stats['median']
+                    outlier_count = 0
+                stats_json = self._spliced_profile(col, new_stats, (q1, q3),
+                                                   outlier_count)
+            else:
+                # Fallback: full profile of the modified frame (assign shares
+                # the unchanged columns under copy-on-write).
+                if scale is not None:
+                    new_arr = orig_arr * scale
+                else:
+                    new_arr = np.full(len(orig_arr), val)
+                modified_df = df.assign(**{col: new_arr})
+                stats_json = profile_dataframe(modified_df)
+
             # Create comprehensive what-if report
             what_if_report = f"""## 🎯 What-If Scenario Analysis Results
 
@@ -169,20 +285,29 @@ class Orchestrator:
             else:
                 what_if_report += "\nNo significant correlations found with other numerical variables."
             
-            what_if_report += f"""
+            what_if_report += """
 
 ### 🧠 AI Analysis of Modified Dataset
 
-{scenario_report}
+"""
+
+            footer = """
 
 ---
 *💡 This analysis shows potential impacts based on statistical relationships in your data. Actual business results may vary based on external factors not captured in this dataset.*
 """
-            
-            print("--- ✅ What-If Analysis Complete ---")
-            return what_if_report
-            
+
+            def scenario_stream() -> Iterator[str]:
+                # The precomputed summary renders immediately; the AI analysis
+                # streams in behind it instead of blocking the whole report.
+                yield what_if_report
+                yield from self._stream_report(stats_json)
+                yield footer
+                print("--- ✅ What-If Analysis Complete ---")
+
+            return scenario_stream()
+
         except Exception as e:
             error_message = f"❌ Error during what-if analysis: {str(e)}"
             print(error_message)
-            return error_message
+            return iter([error_message])
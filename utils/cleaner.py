@@ -1,19 +1,43 @@
+import hashlib
+
 import pandas as pd
+import streamlit as st
+
+def dataframe_hash(df: pd.DataFrame) -> bytes:
+    """Content hash of a DataFrame, used as a Streamlit cache key."""
+    digest = hashlib.blake2b()
+    # hash_pandas_object covers values and index but not the header, and
+    # two frames that differ only in column names must not share a key.
+    digest.update(str(tuple(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.digest()
 
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_hash})
 def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans a DataFrame by imputing missing values based on column type.
     - Fills numerical columns with the median.
     - Fills categorical and datetime columns with the mode.
     """
-    cleaned_df = df.copy()
-    for column in cleaned_df.columns:
-        if cleaned_df[column].isnull().any():
-            if pd.api.types.is_numeric_dtype(cleaned_df[column]):
-                median_val = cleaned_df[column].median()
-                cleaned_df[column].fillna(median_val, inplace=True)
-            else: # For object, category, and datetime types
-                mode_val = cleaned_df[column].mode()[0]
-                cleaned_df[column].fillna(mode_val, inplace=True)
+    # Only columns that actually contain nulls get a fill value computed:
+    # median/mode over already-clean columns is pure wasted work.
+    null_cols = df.columns[df.isna().any()]
+    if len(null_cols) == 0:
+        print("✅ DataFrame cleaned successfully.")
+        return df
+
+    numeric_null = df[null_cols].select_dtypes(include="number").columns
+    other_null = null_cols.difference(numeric_null)
+
+    fill_values = {}
+    if len(numeric_null):
+        fill_values.update(df[numeric_null].median())
+    if len(other_null): # For object, category, and datetime types
+        fill_values.update(df[other_null].mode().iloc[0])
+
+    # A single dict-driven fillna replaces the copy-then-assign pattern:
+    # under copy-on-write the untouched columns share their buffers with
+    # the input instead of being rewritten.
+    cleaned_df = df.fillna(fill_values)
     print("✅ DataFrame cleaned successfully.")
     return cleaned_df
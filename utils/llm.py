@@ -0,0 +1,15 @@
+from functools import lru_cache
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+@lru_cache(maxsize=8)
+def get_llm(model: str = "gemini-2.5-flash", temperature: float = 0.5) -> ChatGoogleGenerativeAI:
+    """
+    Shared Gemini client, one per (model, temperature) configuration.
+
+    Constructing ChatGoogleGenerativeAI sets up the HTTP client and auth
+    state, so every agent builder in the app reuses one instance — and one
+    connection pool — instead of each creating its own. The client itself
+    is stateless across calls, so sharing is safe.
+    """
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
@@ -1,36 +1,30 @@
-import pandas as pd
-
-def profile_dataframe(df: pd.DataFrame) -> dict:
-    """
-    Performs a full statistical analysis of a DataFrame.
-    """
-    # Basic Statistics
-    numerical_cols = df.select_dtypes(include=["number"]).columns
-    stats = df[numerical_cols].describe().to_dict()
-
-    # Outlier Detection
-    outliers_summary = {}
-    for col in numerical_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        outlier_condition = (df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))
-        outliers_summary[col] = int(outlier_condition.sum())
-
-    # Categorical Analysis
-    categorical_cols = df.select_dtypes(include=["object", "category"]).columns
-    categorical_analysis = {}
-    for col in categorical_cols:
-        categorical_analysis[col] = {
-            "value_counts": df[col].value_counts().to_dict(),
-            "unique_values_count": int(df[col].nunique())
-        }
-        
-    # Combine into a single dictionary
-    full_profile = {
-        "basic_statistics": stats,
-        "outliers_count": outliers_summary,
-        "categorical_analysis": categorical_analysis
-    }
-    print("✅ DataFrame profiled successfully.")
-    return full_profile
+import sys
+import os
+
+import pandas as pd
+import streamlit as st
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Agent_Cleaning.data_manager import DataFrameManager
+from Inference_agent.inference_tools import InferenceToolSet, to_json
+from utils.cleaner import dataframe_hash
+
+@st.cache_data(hash_funcs={pd.DataFrame: dataframe_hash})
+def profile_dataframe(df: pd.DataFrame) -> str:
+    """
+    Performs a full statistical analysis of a DataFrame.
+
+    The pipeline always needs the complete summary, so the InferenceToolSet
+    methods are called directly here — no LLM round-trip to decide on a tool
+    plan that is fixed anyway. The tool-calling inference agent remains
+    available for free-form statistical questions.
+
+    Returns the combined profile as a JSON string ready for the analyzer.
+    """
+    toolset = InferenceToolSet(DataFrameManager(df))
+
+    # full_profile fuses the describe/IQR work; serialize once at the edge.
+    full_profile = toolset.full_profile()
+    print("✅ DataFrame profiled successfully.")
+    return to_json(full_profile)